@@ -17,8 +17,10 @@ Startup sequence
 from __future__ import annotations
 
 import logging
+import time
 from datetime import datetime, timezone
 
+import pandas as pd
 import streamlit as st
 from sqlalchemy.exc import IntegrityError
 
@@ -66,6 +68,38 @@ st.set_page_config(page_title="Job Finder", layout="wide")
 # ---------------------------------------------------------------------------
 _LINK_COL_CONFIG = {"job_url": st.column_config.LinkColumn("job_url")}
 
+# Partial results shown while scoring is still running
+_LIVE_TOP_K = 20
+_LIVE_RENDER_INTERVAL_SECONDS = 0.5
+
+
+def _live_results_renderer(placeholder):
+    """Return a result callback that redraws the top-scored jobs in *placeholder*.
+
+    Redraws are throttled to one every ``_LIVE_RENDER_INTERVAL_SECONDS`` so a
+    burst of finished calls does not re-send the table for each row.
+    """
+    rows = []
+    last_render = 0.0
+
+    def _on_result(job_row, score, reasoning) -> None:
+        nonlocal last_render
+        rows.append({**job_row.to_dict(), "match_score": score, "reasoning": reasoning})
+        now = time.monotonic()
+        if now - last_render < _LIVE_RENDER_INTERVAL_SECONDS:
+            return
+        last_render = now
+        partial_df = pd.DataFrame(rows).nlargest(_LIVE_TOP_K, "match_score")
+        placeholder.dataframe(partial_df, use_container_width=True, column_config=_LINK_COL_CONFIG)
+
+    return _on_result
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_cv_text(data: bytes, filename: str) -> str:
+    """Extract CV text, memoised on the uploaded bytes so resubmits skip the parse."""
+    return extract_cv_text(data, filename)
+
 
 # ---------------------------------------------------------------------------
 # 6.2  Login / Register page
@@ -221,7 +255,7 @@ def render_profile_page() -> None:
 
         # Resolve CV text: use uploaded file or fall back to stored text
         if cv_file is not None:
-            cv_text = extract_cv_text(cv_file.read(), cv_file.name)
+            cv_text = _cached_cv_text(cv_file.getvalue(), cv_file.name)
             if not cv_text.strip():
                 st.error("Could not extract text from CV.")
                 return
@@ -334,6 +368,7 @@ def render_search_page() -> None:
         return
 
     if st.button("Search Now"):
+        live_placeholder = st.empty()
         with st.spinner("Running job search pipeline…"):
             try:
                 # Build a plain namespace so _run_pipeline_for_user gets the fields it needs
@@ -355,10 +390,15 @@ def render_search_page() -> None:
                     def international_location_list(self):
                         return profile_intl_location_list
 
-                scored_df = _run_pipeline_for_user(_ProfileProxy(user_id))
+                scored_df = _run_pipeline_for_user(
+                    _ProfileProxy(user_id),
+                    result_callback=_live_results_renderer(live_placeholder),
+                )
             except Exception as exc:
+                live_placeholder.empty()
                 st.error(f"Search failed: {exc}")
                 return
+        live_placeholder.empty()
 
         if scored_df.empty:
             st.info("No matching jobs found for your profile.")
@@ -5,6 +5,17 @@ import io
 import fitz
 from docx import Document
 
+# Default "text" flags minus ligature/whitespace preservation: ligatures such as
+# "ﬁ" come out as plain letters and odd whitespace as spaces, which is what the
+# scorer wants, and MuPDF skips that post-processing.
+_PDF_TEXT_FLAGS = fitz.TEXT_MEDIABOX_CLIP | fitz.TEXT_CID_FOR_UNKNOWN_UNICODE
+
+
+def _extract_pdf_text(data: bytes) -> str:
+    """Concatenate the plain text of every page in a PDF."""
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return "".join([page.get_text("text", flags=_PDF_TEXT_FLAGS) for page in doc])
+
 
 def extract_cv_text_from_path(path: str) -> str:
     """Read a PDF or DOCX file from disk and return extracted text."""
@@ -15,11 +26,7 @@ def extract_cv_text_from_path(path: str) -> str:
         data = f.read()
 
     if name.endswith(".pdf"):
-        pages = []
-        with fitz.open(stream=data, filetype="pdf") as doc:
-            for page in doc:
-                pages.append(page.get_text())
-        return "".join(pages)
+        return _extract_pdf_text(data)
 
     if name.endswith(".docx"):
         doc = Document(io.BytesIO(data))
@@ -33,11 +40,7 @@ def extract_cv_text(data: bytes, filename: str) -> str:
     name = filename.lower()
 
     if name.endswith(".pdf"):
-        pages = []
-        with fitz.open(stream=data, filetype="pdf") as doc:
-            for page in doc:
-                pages.append(page.get_text())
-        return "".join(pages)
+        return _extract_pdf_text(data)
 
     if name.endswith(".docx"):
         doc = Document(io.BytesIO(data))
@@ -18,6 +18,7 @@ from __future__ import annotations
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -44,12 +45,12 @@ try:
     from src.database import get_scheduled_users, get_session, save_job_result
     from src.email_sender import send_results_email
     from src.scoring import score_jobs
-    from src.sponsors import load_sponsor_register, verify_sponsors
+    from src.sponsors import SPONSOR_LOAD_TIMEOUT_SECONDS, load_sponsor_register, verify_sponsors
 except ModuleNotFoundError:
     from database import get_scheduled_users, get_session, save_job_result  # type: ignore[no-redef]
     from email_sender import send_results_email  # type: ignore[no-redef]
     from scoring import score_jobs  # type: ignore[no-redef]
-    from sponsors import load_sponsor_register, verify_sponsors  # type: ignore[no-redef]
+    from sponsors import SPONSOR_LOAD_TIMEOUT_SECONDS, load_sponsor_register, verify_sponsors  # type: ignore[no-redef]
 
 logger = logging.getLogger(__name__)
 
@@ -68,7 +69,19 @@ def _is_uk_location(location: str) -> bool:
     return any(kw in location.lower() for kw in _UK_KEYWORDS)
 
 
-def _run_pipeline_for_user(profile) -> pd.DataFrame:
+@st.cache_resource
+def _gemini_client(api_key: str):
+    """Return a Gemini client for *api_key*, reused across runs and reruns.
+
+    Keeping one client per key keeps its HTTP connection pool warm instead of
+    paying a fresh TLS handshake on every search.
+    """
+    from google import genai
+
+    return genai.Client(api_key=api_key)
+
+
+def _run_pipeline_for_user(profile, result_callback=None) -> pd.DataFrame:
     """Execute scrape → sponsor-verify (UK only) → score for a single user.
 
     UK locations: sponsor filter applied (only verified UK visa sponsors kept).
@@ -78,6 +91,9 @@ def _run_pipeline_for_user(profile) -> pd.DataFrame:
     ----------
     profile:
         A profile object with uk_location_list and international_location_list properties.
+    result_callback:
+        Optional callable(job_row, score, reasoning) invoked as each job is
+        scored, with ``job_row`` the scraped row as a ``pd.Series``.
 
     Returns
     -------
@@ -106,10 +122,9 @@ def _run_pipeline_for_user(profile) -> pd.DataFrame:
     if not api_key:
         raise EnvironmentError("GEMINI_API_KEY environment variable is not set.")
 
-    from google import genai
     from google.api_core import exceptions as google_exceptions
 
-    client = genai.Client(api_key=api_key)
+    client = _gemini_client(api_key)
 
     import jobspy
 
@@ -118,6 +133,12 @@ def _run_pipeline_for_user(profile) -> pd.DataFrame:
 
     # --- UK locations: sponsor filter applied ---
     uk_locations = getattr(profile, "uk_location_list", ["London"])
+    sponsors_future = None
+    if uk_locations:
+        # Download the register in the background while the first scrape runs
+        prefetch = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        sponsors_future = prefetch.submit(load_sponsor_register)
+        prefetch.shutdown(wait=False)
     for location in uk_locations:
         logger.info("🇬🇧 Scraping UK jobs in %r for user_id=%s...", location, profile.user_id)
         try:
@@ -138,11 +159,17 @@ def _run_pipeline_for_user(profile) -> pd.DataFrame:
             continue
 
         if sponsors is None:
-            sponsors = load_sponsor_register()
+            try:
+                sponsors = sponsors_future.result(timeout=SPONSOR_LOAD_TIMEOUT_SECONDS)
+            except TimeoutError as e:
+                raise TimeoutError(
+                    f"Sponsor register did not load within {SPONSOR_LOAD_TIMEOUT_SECONDS}s."
+                ) from e
         sponsor_results = verify_sponsors(loc_df["company"], sponsors)
-        loc_df = loc_df.copy()
-        loc_df["verified_sponsor"] = sponsor_results["verified_sponsor"]
-        loc_df["sponsor_match_score"] = sponsor_results["sponsor_match_score"]
+        loc_df = loc_df.assign(
+            verified_sponsor=sponsor_results["verified_sponsor"],
+            sponsor_match_score=sponsor_results["sponsor_match_score"],
+        )
         verified = loc_df[loc_df["verified_sponsor"]].copy()
         logger.info("%d sponsor-verified jobs in %r.", len(verified), location)
         if not verified.empty:
@@ -169,9 +196,7 @@ def _run_pipeline_for_user(profile) -> pd.DataFrame:
             logger.info("No jobs scraped in %r.", location)
             continue
 
-        loc_df = loc_df.copy()
-        loc_df["verified_sponsor"] = False
-        loc_df["sponsor_match_score"] = 0
+        loc_df = loc_df.assign(verified_sponsor=False, sponsor_match_score=0)
         logger.info("%d jobs in %r (no sponsor filter).", len(loc_df), location)
         filtered_dfs.append(loc_df)
 
@@ -182,13 +207,19 @@ def _run_pipeline_for_user(profile) -> pd.DataFrame:
     jobs_df = pd.concat(filtered_dfs, ignore_index=True).drop_duplicates(subset="job_url", keep="first")
     logger.info("Scoring %d total jobs for user_id=%s...", len(jobs_df), profile.user_id)
 
+    score_kwargs = {}
+    if result_callback is not None:
+        score_kwargs["result_callback"] = lambda pos, score, reasoning: result_callback(
+            jobs_df.iloc[pos], score, reasoning
+        )
+
     # Score jobs with retry logic for rate limiting
     max_retries = 3
     retry_delay = 60  # seconds
     
     for attempt in range(max_retries):
         try:
-            scored_df = score_jobs(profile.cv_text, jobs_df, client)
+            scored_df = score_jobs(profile.cv_text, jobs_df, client, **score_kwargs)
             return scored_df
         except google_exceptions.ResourceExhausted as e:
             if attempt < max_retries - 1:
@@ -4,6 +4,7 @@ import logging
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
@@ -16,7 +17,7 @@ from src.email_sender import send_results_email
 from src.result_store import CUMULATIVE_CSV_PATH, merge_results
 from src.scoring import score_jobs
 from src.setup_prompt import run_setup
-from src.sponsors import load_sponsor_register, verify_sponsors
+from src.sponsors import SPONSOR_LOAD_TIMEOUT_SECONDS, load_sponsor_register, verify_sponsors
 from src.tiers import assign_tier
 
 LOG_PATH = Path.home() / ".job_finder" / "scheduler.log"
@@ -43,6 +44,13 @@ def run_pipeline(config: dict) -> pd.DataFrame:
     target_role = config["target_role"]
     interval_days = config["run_interval_days"]
 
+    # The sponsor download and CV parse don't depend on the scrape, so run them
+    # in the background while jobspy works. Errors surface at .result() below.
+    prefetch = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+    sponsors_future = prefetch.submit(load_sponsor_register)
+    cv_future = prefetch.submit(extract_cv_text_from_path, config["cv_path"])
+    prefetch.shutdown(wait=False)
+
     # Stage 1: Scrape jobs
     try:
         import jobspy
@@ -68,11 +76,17 @@ def run_pipeline(config: dict) -> pd.DataFrame:
         return pd.DataFrame()
 
     # Stage 2: Sponsor verification
-    sponsors = load_sponsor_register()
+    try:
+        sponsors = sponsors_future.result(timeout=SPONSOR_LOAD_TIMEOUT_SECONDS)
+    except TimeoutError as e:
+        raise TimeoutError(
+            f"Sponsor register did not load within {SPONSOR_LOAD_TIMEOUT_SECONDS}s."
+        ) from e
     sponsor_results = verify_sponsors(jobs_df["company"], sponsors)
-    jobs_df = jobs_df.copy()
-    jobs_df["verified_sponsor"] = sponsor_results["verified_sponsor"]
-    jobs_df["sponsor_match_score"] = sponsor_results["sponsor_match_score"]
+    jobs_df = jobs_df.assign(
+        verified_sponsor=sponsor_results["verified_sponsor"],
+        sponsor_match_score=sponsor_results["sponsor_match_score"],
+    )
 
     verified_df = jobs_df[jobs_df["verified_sponsor"]].copy()
     verified_count = len(verified_df)
@@ -82,19 +96,16 @@ def run_pipeline(config: dict) -> pd.DataFrame:
         return verified_df
 
     # Stage 3: Score jobs
-    cv_text = extract_cv_text_from_path(config["cv_path"])
+    cv_text = cv_future.result()
     scored_df = score_jobs(cv_text, verified_df, client)
     scored_count = len(scored_df)
     print(f"[{_ts()}] Stage 3 – Scoring complete: {scored_count} jobs scored.")
 
-    # Assign match tiers
-    scored_df = scored_df.copy()
-    scored_df["match_tier"] = scored_df["match_score"].apply(assign_tier)
-
-    # Stamp the run timestamp
-    scored_df["run_timestamp"] = _ts()
-
-    return scored_df
+    # Assign match tiers and stamp the run timestamp in one copy
+    return scored_df.assign(
+        match_tier=scored_df["match_score"].map(assign_tier),
+        run_timestamp=_ts(),
+    )
 
 
 def main() -> None:
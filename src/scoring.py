@@ -1,18 +1,75 @@
 """AI-powered job-to-CV matching using Google Gemini."""
 
-import json
+import logging
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 
+import httpx
+import numpy as np
+import orjson
 import pandas as pd
 from google import genai
-from google.genai import types
+from google.genai import errors, types
+from rapidfuzz import fuzz, process, utils
 
 GEMINI_MODEL = "gemini-2.5-flash"
 GEMINI_DELAY_SECONDS = 1.5
+# Upper bound on job descriptions marshalled into one prompt when batching.
+# Larger batches cut request count further but grow per-call latency and
+# widen the blast radius of a single malformed response.
+GEMINI_MAX_BATCH_SIZE = 15
+# Gemini calls are network-bound, so several can be in flight at once. Request
+# starts are still spaced GEMINI_DELAY_SECONDS apart to respect the RPM quota.
+GEMINI_MAX_WORKERS = 8
+# Per-request ceiling for realtime calls, so a hung connection frees its
+# worker (and counts towards the circuit breaker) instead of blocking it.
+GEMINI_REQUEST_TIMEOUT_SECONDS = 120
+
+# Gemini Batch API: ~50% cheaper, no per-request rate limit, but asynchronous.
+GEMINI_BATCH_POLL_SECONDS = 30
+GEMINI_BATCH_TIMEOUT_SECONDS = 2 * 60 * 60
+
+# Explicit context cache for the shared CV + instructions prefix. Only needs
+# to outlive one run; it is deleted as soon as scoring finishes.
+GEMINI_CONTEXT_CACHE_TTL_SECONDS = 30 * 60
+_BATCH_JOB_DONE_STATES = {
+    types.JobState.JOB_STATE_SUCCEEDED,
+    types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+    types.JobState.JOB_STATE_FAILED,
+    types.JobState.JOB_STATE_CANCELLED,
+    types.JobState.JOB_STATE_EXPIRED,
+}
+_BATCH_JOB_USABLE_STATES = {
+    types.JobState.JOB_STATE_SUCCEEDED,
+    types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+}
 
-# Retry config for transient Gemini errors (429, 503)
-_MAX_RETRIES = 2
-_RETRY_BASE_DELAY = 10  # seconds; doubles each attempt: 10, 20
+_PREFILTER_REASON = "Prefilter: low skill overlap"
+
+logger = logging.getLogger(__name__)
+
+# Retry config for transient Gemini errors (429, 5xx)
+_MAX_RETRIES = 3
+_RETRY_BASE_DELAY = 10  # seconds; doubles each attempt: 10, 20, then the cap
+_RETRY_MAX_DELAY = 30  # seconds; cap on our own exponential backoff
+# A 429's RetryInfo.retryDelay replaces the backoff; per-minute quotas refill
+# within a minute, so a longer hint is clamped to this.
+_RETRY_MAX_SERVER_DELAY = 60
+# Up to +50% random spread, so parallel workers that failed together don't
+# all retry in the same instant and trip the rate limit again.
+_RETRY_JITTER = 0.5
+_RETRYABLE_STATUS_CODES = {500, 503, 504}
+
+# Circuit breaker: after this many consecutive outage errors (5xx, timeouts,
+# connection failures) in a run, new calls are held for the reset period and
+# then one probe goes out. Once the probes keep failing, the remaining jobs
+# fail fast instead of each waiting out retries and pacing.
+GEMINI_BREAKER_FAILURE_THRESHOLD = 5
+GEMINI_BREAKER_RESET_SECONDS = 30
+GEMINI_BREAKER_MAX_PROBES = 3
+_BREAKER_OPEN_REASON = "Scoring failed (breaker open): Gemini is unavailable."
 
 SYSTEM_PROMPT = """\
 You are a highly strategic, perceptive Executive Headhunter. Your job is to \
@@ -55,13 +112,75 @@ biggest gap. If the score is 80 or above, highlight the strongest matching \
 competency."""
 
 
-def _build_prompt(cv_text: str, job_description: str) -> str:
+# Static prompt pieces, joined once at import rather than on every call
+_PROMPT_HEAD = SYSTEM_PROMPT + "\n\nCV:\n"
+_JOB_DESCRIPTION_HEADER = "\n\nJob Description:\n"
+
+
+def _build_prompt_prefix(cv_text: str) -> str:
+    """Build the part of every scoring prompt that is identical across jobs.
+
+    Rendered once per score_jobs run instead of once per job; keeping it a
+    stable, byte-identical prefix also lets Gemini's implicit prompt caching
+    discount the repeated system prompt and CV tokens.
+    """
+    return _PROMPT_HEAD + cv_text
+
+
+def _build_prompt(prompt_prefix: str, job_description: str) -> str:
     """Build the scoring prompt using safe string concatenation.
 
     Avoids str.format() because job descriptions are untrusted external input
     and may contain curly braces (e.g. code snippets in job postings).
     """
-    return SYSTEM_PROMPT + "\n\nCV:\n" + cv_text + "\n\nJob Description:\n" + job_description
+    return "".join((prompt_prefix, _JOB_DESCRIPTION_HEADER, job_description))
+
+
+def _cache_prompt_prefix(
+    client: genai.Client,
+    config: types.GenerateContentConfig,
+    prompt_prefix: str,
+) -> tuple[types.GenerateContentConfig, str | None]:
+    """Store the shared prompt prefix as Gemini cached content.
+
+    Returns the config pointing at the cache and the cache name, or the
+    config unchanged and None when caching is unavailable (for example a
+    prefix below the model's minimum cacheable size), in which case the
+    prefix is simply sent inline as before.
+    """
+    try:
+        cache = client.caches.create(
+            model=GEMINI_MODEL,
+            config=types.CreateCachedContentConfig(
+                contents=[prompt_prefix],
+                ttl=f"{GEMINI_CONTEXT_CACHE_TTL_SECONDS}s",
+            ),
+        )
+    except Exception as exc:
+        logger.info("Gemini context cache unavailable (%s); sending the full prompt.", exc)
+        return config, None
+    return config.model_copy(update={"cached_content": cache.name}), cache.name
+
+
+def _build_batch_prompt(prompt_prefix: str, job_descriptions: list[str]) -> str:
+    """Build one prompt that asks Gemini to score several jobs at once.
+
+    Jobs are numbered so the model can return its evaluations as an array in
+    the same order. Uses concatenation for the same reason as _build_prompt.
+    """
+    parts = [
+        prompt_prefix,
+        "\n\nEvaluate each of the following ",
+        str(len(job_descriptions)),
+        " job descriptions independently against the CV. Return a JSON array "
+        "with exactly one evaluation object per job, in the same order as the "
+        "jobs are numbered.",
+    ]
+    for number, description in enumerate(job_descriptions, start=1):
+        parts.append(f"\n\n### JOB {number}\n")
+        parts.append(description)
+    return "".join(parts)
+
 
 SCORE_SCHEMA = {
     "type": "object",
@@ -72,54 +191,348 @@ SCORE_SCHEMA = {
     "required": ["match_score", "reasoning"],
 }
 
+BATCH_SCORE_SCHEMA = {"type": "array", "items": SCORE_SCHEMA}
+
+# Built once and shared by every score_jobs call; never mutated.
+_REQUEST_HTTP_OPTIONS = types.HttpOptions(timeout=GEMINI_REQUEST_TIMEOUT_SECONDS * 1000)
+_SINGLE_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    response_schema=SCORE_SCHEMA,
+    http_options=_REQUEST_HTTP_OPTIONS,
+)
+_BATCH_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    response_schema=BATCH_SCORE_SCHEMA,
+    http_options=_REQUEST_HTTP_OPTIONS,
+)
+
+
+def _error_details(exc: Exception) -> list[dict]:
+    """Return the google.rpc detail objects attached to a Gemini API error."""
+    body = getattr(exc, "details", None) if isinstance(exc, errors.APIError) else None
+    details = body.get("error", {}).get("details") if isinstance(body, dict) else None
+    return [d for d in details if isinstance(d, dict)] if isinstance(details, list) else []
+
+
+def _is_daily_quota(exc: Exception) -> bool:
+    """Return True if a 429 names a per-day quota, which no backoff will clear.
+
+    Per-minute and per-day quota errors share the same RESOURCE_EXHAUSTED
+    status and message; only the QuotaFailure quota ids tell them apart.
+    """
+    for detail in _error_details(exc):
+        if detail.get("@type", "").endswith("google.rpc.QuotaFailure"):
+            for violation in detail.get("violations", []):
+                if "PerDay" in str(violation.get("quotaId", "")):
+                    return True
+    return False
+
+
+def _server_retry_delay(exc: Exception) -> float | None:
+    """Return the seconds from an error's RetryInfo.retryDelay (e.g. "37s"), if any."""
+    for detail in _error_details(exc):
+        if detail.get("@type", "").endswith("google.rpc.RetryInfo"):
+            try:
+                return float(str(detail.get("retryDelay", "")).removesuffix("s"))
+            except ValueError:
+                return None
+    return None
+
 
 def _is_retryable(exc: Exception) -> bool:
     """Return True for transient Gemini errors that warrant a retry.
 
-    429 RESOURCE_EXHAUSTED = daily quota exceeded — NOT retryable (wait until reset).
-    429 Too Many Requests (rate limit) = retryable with backoff.
-    503 UNAVAILABLE = temporary overload — retryable.
+    429 against a per-day quota = NOT retryable (wait until reset).
+    Any other 429 (per-minute rate limit) = retryable with backoff.
+    500 / 503 UNAVAILABLE / 504 DEADLINE_EXCEEDED = temporary overload — retryable.
     """
+    if isinstance(exc, errors.APIError):
+        if exc.code == 429:
+            return not _is_daily_quota(exc)
+        return exc.code in _RETRYABLE_STATUS_CODES
     msg = str(exc).lower()
-    # Daily quota exhausted — do not retry
-    if "resource_exhausted" in msg or "exceeded your current quota" in msg:
-        return False
     # Temporary rate limit or overload — retry
-    return any(code in msg for code in ("503", "unavailable", "too many requests"))
+    return any(code in msg for code in ("429", "503", "unavailable", "too many requests"))
 
 
-def _score_single(
+def _is_outage(exc: Exception) -> bool:
+    """Return True for errors that mean Gemini itself is down or unreachable.
+
+    A 4xx, including a 429 rate limit, means the endpoint answered, so it
+    must not count towards opening the circuit breaker.
+    """
+    if isinstance(exc, errors.APIError):
+        return exc.code >= 500
+    return isinstance(exc, (httpx.TransportError, TimeoutError, ConnectionError))
+
+
+class _CircuitBreaker:
+    """Closed/open/half-open breaker around the Gemini endpoint.
+
+    CLOSED lets calls through. ``failure_threshold`` consecutive failures trip
+    it OPEN, which holds calls until ``reset_timeout`` seconds have passed;
+    the next call is then let through as a HALF_OPEN probe, which closes the
+    breaker on success or reopens it on failure. After ``max_probes`` failed
+    probes in a row it gives up and rejects every call. Thread-safe, since
+    outcomes are recorded from pool workers.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, max_probes: int):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_probes = max_probes
+        self.state = self.CLOSED
+        self._failures = 0
+        self._failed_probes = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait_until_allowed(self) -> bool:
+        """Block until a call may go out, sleeping out the OPEN period.
+
+        Returns True for a CLOSED breaker or once the reset timeout has passed
+        (the caller's call is then the probe), or False after ``max_probes``
+        failed probes. Meant for the single submitting thread, which holds
+        further calls until its probe has finished.
+        """
+        while True:
+            with self._lock:
+                if self.state == self.CLOSED:
+                    return True
+                if self._failed_probes >= self.max_probes:
+                    return False
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if self.state == self.HALF_OPEN or remaining <= 0:
+                    self.state = self.HALF_OPEN
+                    return True
+            time.sleep(remaining)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._failed_probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN:
+                self._failed_probes += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning("Gemini circuit breaker opened after %d failures.", self._failures)
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+def _retry_delay(attempt: int, exc: Exception | None = None) -> float:
+    """Return the jittered wait before retry number *attempt* (0-based).
+
+    Uses the server's RetryInfo delay for *exc* when it sends one, otherwise
+    capped exponential backoff.
+    """
+    hint = _server_retry_delay(exc) if exc is not None else None
+    if hint is not None:
+        delay = min(hint, _RETRY_MAX_SERVER_DELAY)
+    else:
+        delay = min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2**attempt)
+    return delay * (1 + random.uniform(0, _RETRY_JITTER))
+
+
+def _generate_with_retry(
     client: genai.Client,
     config: types.GenerateContentConfig,
-    cv_text: str,
-    description: str,
-) -> tuple[int, str]:
-    """Score one job description against the CV with exponential backoff retry.
-
-    Returns (match_score, reasoning).
+    prompt: str,
+    breaker: _CircuitBreaker | None = None,
+):
+    """Send one prompt to Gemini with jittered exponential backoff retry.
+
+    Returns the parsed JSON response. Re-raises the last exception once the
+    error is non-retryable or retries are exhausted. If a breaker is given,
+    the call's outcome is recorded on it: only outage errors count as
+    failures, while a 4xx or a response that fails to decode still counts as
+    the endpoint being up.
     """
-    delay = _RETRY_BASE_DELAY
-    last_exc: Exception | None = None
+    generate_content = client.models.generate_content
 
     for attempt in range(_MAX_RETRIES + 1):
         try:
-            response = client.models.generate_content(
+            response = generate_content(
                 model=GEMINI_MODEL,
-                contents=_build_prompt(cv_text, description),
+                contents=prompt,
                 config=config,
             )
-            result = json.loads(response.text)
-            return result["match_score"], result["reasoning"]
         except Exception as exc:
-            last_exc = exc
             if _is_retryable(exc) and attempt < _MAX_RETRIES:
-                time.sleep(delay)
-                delay *= 2  # exponential backoff
+                time.sleep(_retry_delay(attempt, exc))
                 continue
             # Non-retryable or exhausted retries — give up
-            break
+            if breaker is not None:
+                if _is_outage(exc):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            raise
+        if breaker is not None:
+            breaker.record_success()
+        return orjson.loads(response.text)
+
+
+def _parse_evaluation(result) -> tuple[int, str]:
+    """Return (match_score, reasoning) from one decoded evaluation object.
+
+    The score is rounded and clamped to 0-100 so it always fits the int16
+    score column; a missing or non-numeric score raises, and the caller turns
+    it into that row's failure entry.
+    """
+    score = result["match_score"]
+    if isinstance(score, bool) or not isinstance(score, (int, float)):
+        raise ValueError(f"match_score is not a number: {score!r}")
+    return min(100, max(0, round(score))), result["reasoning"]
+
+
+def _score_single(
+    client: genai.Client,
+    config: types.GenerateContentConfig,
+    prompt_prefix: str,
+    description: str,
+    breaker: _CircuitBreaker | None = None,
+) -> tuple[int, str]:
+    """Score one job description against the CV with exponential backoff retry.
+
+    Returns (match_score, reasoning).
+    """
+    try:
+        result = _generate_with_retry(
+            client, config, _build_prompt(prompt_prefix, description), breaker
+        )
+        return _parse_evaluation(result)
+    except Exception as exc:
+        return 0, f"Scoring failed after {_MAX_RETRIES} retries: {exc}"
+
+
+def _score_batch_of_one(
+    client: genai.Client,
+    config: types.GenerateContentConfig,
+    prompt_prefix: str,
+    descriptions: list[str],
+    breaker: _CircuitBreaker | None = None,
+) -> list[tuple[int, str]]:
+    """Adapter giving _score_single the same list-in, list-out shape as _score_batch."""
+    return [_score_single(client, config, prompt_prefix, descriptions[0], breaker)]
+
+
+def _score_batch(
+    client: genai.Client,
+    config: types.GenerateContentConfig,
+    prompt_prefix: str,
+    descriptions: list[str],
+    breaker: _CircuitBreaker | None = None,
+) -> list[tuple[int, str]]:
+    """Score several job descriptions in a single Gemini call.
+
+    Returns one (match_score, reasoning) pair per description, in order. If
+    the response is unusable (bad JSON, wrong length, missing keys) every job
+    in the batch gets the failure row, so scores can never shift between jobs.
+    """
+    try:
+        results = _generate_with_retry(
+            client, config, _build_batch_prompt(prompt_prefix, descriptions), breaker
+        )
+        return _parse_batch_results(results, len(descriptions))
+    except Exception as exc:
+        failure = (0, f"Scoring failed after {_MAX_RETRIES} retries: {exc}")
+        return [failure] * len(descriptions)
+
+
+def _parse_batch_results(results, expected: int) -> list[tuple[int, str]]:
+    """Validate a decoded batch response and return its (score, reasoning) pairs."""
+    if not isinstance(results, list) or len(results) != expected:
+        raise ValueError(
+            f"expected {expected} evaluations, got "
+            f"{len(results) if isinstance(results, list) else type(results).__name__}"
+        )
+    return [_parse_evaluation(r) for r in results]
+
+
+def _run_batch_job(
+    client: genai.Client,
+    config: types.GenerateContentConfig,
+    prompts: list[str],
+) -> list:
+    """Submit prompts as one inline Gemini Batch API job and wait for it to finish.
+
+    Returns one entry per prompt, in submission order: the response text, or an
+    Exception describing why that request failed.
+
+    Raises:
+        RuntimeError: if the job fails, is cancelled or expires.
+        TimeoutError: if the job runs past GEMINI_BATCH_TIMEOUT_SECONDS (the
+            job is cancelled first).
+    """
+    # The request timeout is a client-side setting, not part of a batch request
+    config = config.model_copy(update={"http_options": None})
+    job = client.batches.create(
+        model=GEMINI_MODEL,
+        src=[
+            types.InlinedRequest(contents=prompt, config=config, metadata={"key": str(i)})
+            for i, prompt in enumerate(prompts)
+        ],
+        config=types.CreateBatchJobConfig(display_name="job-finder-scoring"),
+    )
 
-    return 0, f"Scoring failed after {_MAX_RETRIES} retries: {last_exc}"
+    deadline = time.monotonic() + GEMINI_BATCH_TIMEOUT_SECONDS
+    while job.state not in _BATCH_JOB_DONE_STATES:
+        if time.monotonic() > deadline:
+            client.batches.cancel(name=job.name)
+            raise TimeoutError(f"Gemini batch job {job.name} did not finish in time.")
+        time.sleep(GEMINI_BATCH_POLL_SECONDS)
+        job = client.batches.get(name=job.name)
+
+    if job.state not in _BATCH_JOB_USABLE_STATES:
+        raise RuntimeError(f"Gemini batch job {job.name} ended in state {job.state}: {job.error}")
+
+    # Map responses back by the key we submitted rather than trusting order
+    outputs: list = [RuntimeError("No response returned by batch job.")] * len(prompts)
+    for position, item in enumerate(job.dest.inlined_responses or []):
+        key = (item.metadata or {}).get("key", str(position))
+        if item.error is not None or item.response is None:
+            outputs[int(key)] = RuntimeError(f"Batch request failed: {item.error}")
+        else:
+            outputs[int(key)] = item.response.text
+    return outputs
+
+
+def _score_via_batch_api(
+    client: genai.Client,
+    config: types.GenerateContentConfig,
+    prompt_prefix: str,
+    chunks: list[list[tuple[int, str]]],
+    batched: bool,
+) -> list[list[tuple[int, str]]]:
+    """Score every chunk through one Batch API job; returns results per chunk."""
+    if batched:
+        prompts = [_build_batch_prompt(prompt_prefix, [d for _, d in chunk]) for chunk in chunks]
+    else:
+        prompts = [_build_prompt(prompt_prefix, chunk[0][1]) for chunk in chunks]
+
+    chunk_results = []
+    for chunk, output in zip(chunks, _run_batch_job(client, config, prompts)):
+        try:
+            if isinstance(output, Exception):
+                raise output
+            payload = orjson.loads(output)
+            if batched:
+                chunk_results.append(_parse_batch_results(payload, len(chunk)))
+            else:
+                chunk_results.append([_parse_evaluation(payload)])
+        except Exception as exc:
+            chunk_results.append([(0, f"Scoring failed: {exc}")] * len(chunk))
+    return chunk_results
 
 
 def score_jobs(
@@ -127,6 +540,11 @@ def score_jobs(
     df: pd.DataFrame,
     client: genai.Client,
     progress_callback=None,
+    result_callback=None,
+    batch_size: int = 1,
+    use_batch_api: bool = False,
+    prefilter_threshold: int | None = None,
+    cache_prompt_prefix: bool = False,
 ) -> pd.DataFrame:
     """Score each job in the DataFrame against the CV using Gemini.
 
@@ -135,43 +553,173 @@ def score_jobs(
         df: DataFrame with a 'description' column.
         client: Initialised Gemini client.
         progress_callback: Optional callable(current, total) for progress updates.
+        result_callback: Optional callable(position, score, reasoning) invoked on
+            the calling thread as each row's score lands, where position is the
+            row's integer position in df. Lets callers render partial results.
+        batch_size: Number of job descriptions sent per Gemini call. The
+            default of 1 scores each job in its own request; larger values
+            (capped at GEMINI_MAX_BATCH_SIZE) marshal several jobs into one
+            prompt, cutting request count and rate-limit delays roughly by
+            that factor.
+        use_batch_api: Submit all calls as one asynchronous Gemini Batch API
+            job (about half the cost, and no rate-limit delays) and wait for
+            it, instead of making realtime requests. Falls back to realtime
+            scoring if the job fails or times out.
+        cache_prompt_prefix: Upload the CV + instructions once as Gemini cached
+            content and send only the job part with each realtime call, so
+            the prefix tokens are billed at the cached rate. Falls back to
+            inline prompts if the cache can't be created.
+        prefilter_threshold: If set, jobs whose token-set similarity to the CV
+            (rapidfuzz, 0-100) is below this value skip Gemini and get a score
+            of 0. A cheap local filter for clearly off-target postings;
+            disabled by default.
 
     Returns:
         Copy of df with 'match_score' and 'reasoning' columns added.
     """
     if "description" not in df.columns:
-        df = df.copy()
-        df["match_score"] = 0
-        df["reasoning"] = "No description column in data."
-        return df
-
-    scores = []
-    reasonings = []
-    config = types.GenerateContentConfig(
-        response_mime_type="application/json",
-        response_schema=SCORE_SCHEMA,
-    )
+        return df.assign(match_score=0, reasoning="No description column in data.")
+
+    batch_size = max(1, min(batch_size, GEMINI_MAX_BATCH_SIZE))
+    config = _SINGLE_CONFIG if batch_size == 1 else _BATCH_CONFIG
 
+    prompt_prefix = _build_prompt_prefix(cv_text)
     total = len(df)
-    for idx, (_, row) in enumerate(df.iterrows()):
+    # Scores are 0-100, so int16 holds them at a quarter of int64's footprint
+    scores = np.zeros(total, dtype=np.int16)
+    reasonings = np.full(total, "No job description available.", dtype=object)
+
+    # jobspy yields None (or NaN once mixed with strings) for missing text.
+    # Pull the column out as a plain list rather than building a Series per row.
+    descriptions = df["description"].fillna("").astype(str).tolist()
+    # Only rows with a real description cost a Gemini call, and reposts with the
+    # same description are scored once and the result shared. Reposts across
+    # job boards often differ only in whitespace, so that is ignored when
+    # grouping; the first posting's original text is what gets sent.
+    rows_by_key: dict[str, list[int]] = {}
+    first_text: dict[str, str] = {}
+    for idx, desc in enumerate(descriptions):
+        key = " ".join(desc.split())
+        if key:
+            rows_by_key.setdefault(key, []).append(idx)
+            first_text.setdefault(key, desc)
+    to_score = [(rows, first_text[key]) for key, rows in rows_by_key.items()]
+
+    if prefilter_threshold is not None and to_score:
+        overlap = process.cdist(
+            [cv_text],
+            [desc for _, desc in to_score],
+            scorer=fuzz.token_set_ratio,
+            processor=utils.default_process,
+            workers=-1,
+        )[0]
+        kept = []
+        for (rows, desc), similarity in zip(to_score, overlap):
+            if similarity >= prefilter_threshold:
+                kept.append((rows, desc))
+            else:
+                for pos in rows:
+                    reasonings[pos] = _PREFILTER_REASON
+        to_score = kept
+
+    done = total - sum(len(rows) for rows, _ in to_score)
+    if done and progress_callback:
+        progress_callback(done, total)
+
+    chunks = [to_score[i : i + batch_size] for i in range(0, len(to_score), batch_size)]
+    score_chunk = _score_batch if batch_size > 1 else _score_batch_of_one
+    in_flight = {}
+
+    def _store(row_groups: list[list[int]], results: list[tuple[int, str]]) -> None:
+        """Write one call's results against every row sharing each description."""
+        nonlocal done
+        for rows, (score, reasoning) in zip(row_groups, results):
+            for pos in rows:
+                scores[pos] = score
+                reasonings[pos] = reasoning
+                if result_callback:
+                    result_callback(pos, score, reasoning)
+            done += len(rows)
         if progress_callback:
-            progress_callback(idx + 1, total)
-
-        description = row.get("description") or ""
-        if not description.strip():
-            scores.append(0)
-            reasonings.append("No job description available.")
-            continue
-
-        score, reasoning = _score_single(client, config, cv_text, description)
-        scores.append(score)
-        reasonings.append(reasoning)
-
-        # Rate-limit delay between Gemini calls
-        if idx < total - 1:
-            time.sleep(GEMINI_DELAY_SECONDS)
-
-    df = df.copy()
-    df["match_score"] = scores
-    df["reasoning"] = reasonings
-    return df
+            progress_callback(done, total)
+
+    def _record(future) -> None:
+        """Store a finished realtime call's results."""
+        row_groups = in_flight.pop(future)
+        try:
+            results = future.result()
+        except Exception as exc:
+            # One crashed call must not poison the rest of the run
+            results = [(0, f"Scoring failed: {exc}")] * len(row_groups)
+        _store(row_groups, results)
+
+    if use_batch_api and chunks:
+        try:
+            chunk_results = _score_via_batch_api(client, config, prompt_prefix, chunks, batch_size > 1)
+        except Exception as exc:
+            logger.warning("Gemini batch job failed (%s); falling back to realtime scoring.", exc)
+        else:
+            for chunk, results in zip(chunks, chunk_results):
+                _store([rows for rows, _ in chunk], results)
+            chunks = []
+
+    cache_name = None
+    if cache_prompt_prefix and chunks:
+        config, cache_name = _cache_prompt_prefix(client, config, prompt_prefix)
+        if cache_name:
+            prompt_prefix = ""
+
+    # One slot per worker: a chunk is only submitted once a worker is free, so
+    # it starts when paced rather than queueing behind slow calls and then
+    # starting in a burst with the rest of the backlog. Together with pacing
+    # from the previous start, starts are never closer than
+    # GEMINI_DELAY_SECONDS, like a token bucket of capacity 1.
+    slots = threading.Semaphore(GEMINI_MAX_WORKERS)
+    breaker = _CircuitBreaker(
+        GEMINI_BREAKER_FAILURE_THRESHOLD, GEMINI_BREAKER_RESET_SECONDS, GEMINI_BREAKER_MAX_PROBES
+    )
+
+    last_start = None
+
+    with ThreadPoolExecutor(max_workers=GEMINI_MAX_WORKERS) as pool:
+        for chunk in chunks:
+            slots.acquire()
+            if not breaker.wait_until_allowed():
+                # Probes keep failing, Gemini is down: fail fast, without the pacing delay
+                slots.release()
+                _store([rows for rows, _ in chunk], [(0, _BREAKER_OPEN_REASON)] * len(chunk))
+                continue
+            # Rate-limit delay between Gemini request starts. Time already spent
+            # waiting for a free worker counts towards it.
+            if last_start is not None:
+                pause = last_start + GEMINI_DELAY_SECONDS - time.monotonic()
+                if pause > 0:
+                    time.sleep(pause)
+            last_start = time.monotonic()
+            probe = breaker.state == _CircuitBreaker.HALF_OPEN
+
+            chunk_descriptions = [desc for _, desc in chunk]
+            future = pool.submit(
+                score_chunk, client, config, prompt_prefix, chunk_descriptions, breaker
+            )
+            future.add_done_callback(lambda _: slots.release())
+            in_flight[future] = [rows for rows, _ in chunk]
+            if probe:
+                # Hold the remaining chunks until the probe shows whether Gemini is back
+                wait([future])
+
+            # Report calls that finished while we were pacing submissions
+            for finished in [f for f in in_flight if f.done()]:
+                _record(finished)
+
+        for finished in as_completed(list(in_flight)):
+            _record(finished)
+
+    if cache_name:
+        # If this never runs, the TTL expires the cache instead
+        try:
+            client.caches.delete(name=cache_name)
+        except Exception as exc:
+            logger.warning("Could not delete Gemini context cache %s: %s", cache_name, exc)
+
+    return df.assign(match_score=scores, reasoning=reasonings)
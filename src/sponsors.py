@@ -1,16 +1,152 @@
 """UK visa sponsor register loading and verification."""
 
+import csv
+import html
+import io
+import json
+import math
+import os
+import re
+import time
 from functools import lru_cache
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from rapidfuzz import fuzz, process
 
 SPONSOR_PAGE_URL = (
     "https://www.gov.uk/government/publications/register-of-licensed-sponsors-workers"
 )
 SPONSOR_MATCH_THRESHOLD = 85
+# How long a caller waits on a background register load once it needs the
+# result, so a stalled gov.uk download fails the run instead of hanging it.
+SPONSOR_LOAD_TIMEOUT_SECONDS = 120
+
+# Trailing legal-entity noise ("Acme Ltd" vs "Acme Limited" vs "Acme UK Ltd.")
+# that differs between job boards and the register without changing identity.
+_COMPANY_SUFFIX_RE = re.compile(r"(?:\s+(?:ltd|limited|plc|uk|inc)\.?)+$")
+
+# <a> tags pointing at a .csv, capturing href and inner HTML. The gov.uk page
+# only needs this one lookup, so a regex scan replaces a full HTML parse.
+_CSV_LINK_RE = re.compile(
+    r"""<a\b[^>]*?\bhref\s*=\s*["']([^"']+\.csv)["'][^>]*>(.*?)</a\s*>""",
+    re.IGNORECASE | re.DOTALL,
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# On-disk copy of the normalised register, so new processes skip the 11MB
+# download and CSV parse while gov.uk still serves the same file.
+SPONSOR_CACHE_DIR: Path = Path.home() / ".job_finder" / "cache"
+_CACHE_DATA_FILE = "sponsors.parquet"
+_CACHE_META_FILE = "sponsors.json"
+# Within this age the disk copy is used without contacting gov.uk at all;
+# after it, the CSV's ETag/Last-Modified decides whether it is still current.
+SPONSOR_CACHE_MAX_AGE_SECONDS = 24 * 60 * 60
+
+# One pooled session for every gov.uk request, so the page, HEAD and CSV
+# fetches reuse a TCP/TLS connection. requests already negotiates gzip (and
+# br/zstd when a decoder is installed), which shrinks the CSV transfer.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# Read-ahead used to sniff the CSV header; the gov.uk header is ~80 bytes.
+_CSV_HEADER_PEEK_BYTES = 64 * 1024
+
+
+def _read_first_column(stream: io.BufferedReader) -> pa.ChunkedArray:
+    """Parse only the first column of a CSV stream with Arrow's multithreaded reader.
+
+    The header is peeked without consuming it, so Arrow reads the body straight
+    from the stream and the download never has to be held in memory as bytes.
+    Raises pa.ArrowInvalid for an empty or malformed CSV.
+    """
+    first_line = stream.peek(_CSV_HEADER_PEEK_BYTES).split(b"\n", 1)[0].decode("utf-8-sig")
+    header = next(csv.reader([first_line]), None)
+    if not header:
+        raise pa.ArrowInvalid("CSV has no header row")
+    first_col = header[0]
+    table = pv.read_csv(
+        stream,
+        read_options=pv.ReadOptions(use_threads=True),
+        convert_options=pv.ConvertOptions(
+            include_columns=[first_col],
+            column_types={first_col: pa.string()},
+            strings_can_be_null=True,
+        ),
+    )
+    return table.column(0)
+
+
+def _normalise_names(column: pa.ChunkedArray) -> tuple[str, ...]:
+    """Strip and lowercase register names in Arrow, dropping blanks and repeats.
+
+    The register lists an organisation once per route and town, so repeats are
+    common; keeping the first of each shrinks the cached tuple. Order is kept.
+    """
+    names = pc.utf8_lower(pc.utf8_trim_whitespace(column))
+    names = names.filter(pc.greater(pc.utf8_length(names), 0))  # also drops nulls
+    return tuple(pc.unique(names).to_pylist())
+
+
+def _remote_validator(csv_url: str) -> str | None:
+    """Return the CSV's ETag (or Last-Modified) header, or None if unavailable."""
+    try:
+        resp = _SESSION.head(csv_url, timeout=30, allow_redirects=True)
+    except requests.RequestException:
+        return None
+    return resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+
+
+def _read_cache_meta() -> dict:
+    """Return the cached register's {url, validator, fetched_at}, or {} if unusable."""
+    try:
+        meta = json.loads((SPONSOR_CACHE_DIR / _CACHE_META_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+
+def _cache_is_fresh(meta: dict) -> bool:
+    """True if the cached register was fetched or revalidated recently enough to trust."""
+    fetched_at = meta.get("fetched_at")
+    return isinstance(fetched_at, (int, float)) and (
+        0 <= time.time() - fetched_at < SPONSOR_CACHE_MAX_AGE_SECONDS
+    )
+
+
+def _read_disk_cache() -> tuple[str, ...] | None:
+    """Return the cached register names, or None if there is no readable copy."""
+    try:
+        df = pd.read_parquet(SPONSOR_CACHE_DIR / _CACHE_DATA_FILE)
+    except (OSError, ValueError, ImportError):
+        # Missing, corrupt or unreadable cache — fall back to downloading
+        return None
+    return tuple(df["name"])
+
+
+def _write_cache_meta(csv_url: str, validator: str) -> None:
+    """Record which CSV version the cache holds and restart its freshness window."""
+    meta = {"url": csv_url, "validator": validator, "fetched_at": time.time()}
+    (SPONSOR_CACHE_DIR / _CACHE_META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+
+
+def _write_disk_cache(csv_url: str, validator: str, names: tuple[str, ...]) -> None:
+    """Best-effort atomic write of the register and the version it came from."""
+    try:
+        SPONSOR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        data_path = SPONSOR_CACHE_DIR / _CACHE_DATA_FILE
+        tmp_path = data_path.with_suffix(".tmp")
+        pd.DataFrame({"name": names}).to_parquet(tmp_path, compression="zstd")
+        os.replace(tmp_path, data_path)
+        _write_cache_meta(csv_url, validator)
+    except (OSError, ValueError, ImportError):
+        pass
 
 
 @lru_cache(maxsize=1)
@@ -18,58 +154,156 @@ def load_sponsor_register() -> tuple[str, ...]:
     """Download the official UK sponsor register and return normalised company names.
 
     Returns a tuple (hashable for lru_cache) of lowercased, stripped company names.
-    Cached in-process so repeated calls don't re-download the 11MB CSV.
+    Cached in-process so repeated calls don't re-download the 11MB CSV, and on
+    disk under SPONSOR_CACHE_DIR: a copy younger than SPONSOR_CACHE_MAX_AGE_SECONDS
+    is used without any network call, and an older one is reused until the
+    CSV's ETag/Last-Modified changes.
     """
-    page = requests.get(SPONSOR_PAGE_URL, timeout=30)
-    soup = BeautifulSoup(page.text, "html.parser")
-    csv_links = soup.select('a[href$=".csv"]')
+    meta = _read_cache_meta()
+    if _cache_is_fresh(meta):
+        cached = _read_disk_cache()
+        if cached is not None:
+            return cached
+
+    page = _SESSION.get(SPONSOR_PAGE_URL, timeout=30)
+    csv_links = [
+        (html.unescape(href), html.unescape(_TAG_RE.sub("", text)))
+        for href, text in _CSV_LINK_RE.findall(page.text)
+    ]
     # Prefer the link whose text or href mentions "Worker"
     csv_url = None
-    for link in csv_links:
-        href = link.get("href", "")
-        text = link.get_text(strip=True).lower()
-        if "worker" in href.lower() or "worker" in text:
+    for href, text in csv_links:
+        if "worker" in href.lower() or "worker" in text.lower():
             csv_url = href
             break
     if not csv_url and csv_links:
-        csv_url = csv_links[0]["href"]
+        csv_url = csv_links[0][0]
     if not csv_url:
         return ()
-    try:
-        df = pd.read_csv(csv_url)
-    except (pd.errors.ParserError, pd.errors.EmptyDataError):
-        return ()
-    col = df.columns[0]
-    return tuple(df[col].dropna().str.strip().str.lower())
+
+    validator = _remote_validator(csv_url)
+    if validator and meta.get("url") == csv_url and meta.get("validator") == validator:
+        cached = _read_disk_cache()
+        if cached is not None:
+            try:
+                _write_cache_meta(csv_url, validator)
+            except OSError:
+                pass
+            return cached
+
+    resp = _SESSION.get(csv_url, timeout=60, stream=True)
+    with resp:
+        resp.raise_for_status()
+        resp.raw.decode_content = True  # undo gzip transfer encoding while streaming
+        resp.raw.auto_close = False  # io.BufferedReader checks closed before draining its buffer
+        try:
+            # Only the organisation name column is used; skip parsing the rest
+            column = _read_first_column(
+                io.BufferedReader(resp.raw, buffer_size=_CSV_HEADER_PEEK_BYTES)
+            )
+        except pa.ArrowInvalid:
+            return ()
+    names = _normalise_names(column)
+    if validator:
+        _write_disk_cache(csv_url, validator, names)
+    return names
+
+
+def _match_key(name: str) -> str:
+    """Normalise a company name for fuzzy matching.
+
+    Lowercased, legal suffix removed and tokens sorted and joined by single
+    spaces. With tokens pre-sorted, plain fuzz.ratio on two keys equals
+    token_sort_ratio without re-tokenising the register on every comparison,
+    and len(key) is exactly the length being compared, which the length
+    pruning in _best_scores relies on.
+    """
+    stripped = _COMPANY_SUFFIX_RE.sub("", " ".join(name.lower().split()))
+    return " ".join(sorted(stripped.split()))
+
+
+@lru_cache(maxsize=4)
+def _sponsor_index(
+    sponsors: tuple[str, ...],
+) -> tuple[list[str], np.ndarray, frozenset[str]]:
+    """Unique match keys for a register sorted by length, their lengths, and a set.
+
+    Computed once per register so every verify_sponsors call can answer
+    exact matches with a set lookup and slice out the keys of compatible
+    length with a binary search.
+    """
+    key_set = frozenset(_match_key(s) for s in sponsors) - {""}
+    keys = sorted(key_set, key=len)
+    lengths = np.fromiter(map(len, keys), dtype=np.int32, count=len(keys))
+    return keys, lengths, key_set
+
+
+def _best_scores(queries: list[str], keys: list[str], lengths: np.ndarray) -> list[int]:
+    """Best token_sort_ratio of each query against the register (0 below the cutoff).
+
+    Keys are token-sorted by _match_key, so fuzz.ratio gives the same score.
+
+    The Indel ratio of strings of lengths a <= b is at most 200·a/(a+b), so a
+    sponsor can only reach the threshold if its length lies within
+    [L·t/(2-t), L·(2-t)/t] of the query length L (t = threshold/100). Queries
+    are grouped by length (len // 4) and each group is compared, in one cdist
+    call, only against the contiguous slice of length-sorted keys it can match.
+    """
+    best = [0] * len(queries)
+    t = SPONSOR_MATCH_THRESHOLD / 100
+
+    groups: dict[int, list[int]] = {}
+    for i, query in enumerate(queries):
+        if query:
+            groups.setdefault(len(query) // 4, []).append(i)
+
+    for members in groups.values():
+        query_lengths = [len(queries[i]) for i in members]
+        lo = np.searchsorted(lengths, math.floor(min(query_lengths) * t / (2 - t)), side="left")
+        hi = np.searchsorted(lengths, math.ceil(max(query_lengths) * (2 - t) / t), side="right")
+        if lo == hi:
+            continue
+        scores = process.cdist(
+            [queries[i] for i in members],
+            keys[lo:hi],
+            scorer=fuzz.ratio,
+            processor=None,  # both sides are already normalised and token-sorted
+            score_cutoff=SPONSOR_MATCH_THRESHOLD,
+            dtype=np.uint8,
+            workers=-1,
+        )
+        for i, score in zip(members, scores.max(axis=1).tolist()):
+            best[i] = score
+    return best
 
 
 def verify_sponsors(
     company_names: pd.Series, sponsors: list[str] | tuple[str, ...]
 ) -> pd.DataFrame:
     """Batch fuzzy-match company names against the sponsor register."""
-    unique_names = company_names.dropna().unique().tolist()
-    normalised = [str(n).strip().lower() for n in unique_names]
-
-    match_map: dict[str, tuple[bool, int]] = {}
-    for name, norm in zip(unique_names, normalised):
-        result = process.extractOne(
-            norm,
-            sponsors,
-            scorer=fuzz.token_sort_ratio,
-            score_cutoff=SPONSOR_MATCH_THRESHOLD,
-        )
-        if result:
-            match_map[name] = (True, int(result[1]))
-        else:
-            match_map[name] = (False, 0)
+    # codes[i] indexes row i's name in unique_names; NaN company names get -1
+    codes, unique_names = pd.factorize(company_names)
+    normalised = [_match_key(str(n)) for n in unique_names]
 
-    verified = company_names.map(
-        lambda c: match_map.get(c, (False, 0)) if pd.notna(c) else (False, 0)
+    keys, lengths, key_set = _sponsor_index(tuple(sponsors))
+    # Exact matches (common for large employers) are scored 100 with a set
+    # lookup; only the rest need the fuzzy scan.
+    fuzzy_queries = [q for q in dict.fromkeys(normalised) if q not in key_set]
+    fuzzy_scores = dict(zip(fuzzy_queries, _best_scores(fuzzy_queries, keys, lengths)))
+    best = np.fromiter(
+        (100 if q in key_set else fuzzy_scores[q] for q in normalised),
+        dtype=np.int16,
+        count=len(normalised),
     )
+
+    # Scatter the per-name scores back to rows; NaN rows score 0, "not a sponsor"
+    scores = np.zeros(len(codes), dtype=np.int16)
+    has_name = codes >= 0
+    scores[has_name] = best[codes[has_name]]
     return pd.DataFrame(
         {
-            "verified_sponsor": verified.apply(lambda r: r[0]),
-            "sponsor_match_score": verified.apply(lambda r: r[1]),
+            "verified_sponsor": scores >= SPONSOR_MATCH_THRESHOLD,
+            "sponsor_match_score": scores,
         },
         index=company_names.index,
     )
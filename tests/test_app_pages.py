@@ -551,6 +551,23 @@ class TestSearchPageDirect:
         mock_save.assert_not_called()
 
 
+    def test_live_renderer_throttles_redraws(self, mocker):
+        """Partial results are redrawn at most once per render interval."""
+        from src.app import _live_results_renderer
+
+        clock = mocker.patch("src.app.time.monotonic", side_effect=[10.0, 10.1, 10.6])
+        placeholder = MagicMock()
+        on_result = _live_results_renderer(placeholder)
+
+        for i, score in enumerate([40, 90, 70]):
+            on_result(pd.Series({"title": f"Job {i}"}), score, "ok")
+
+        assert clock.call_count == 3
+        assert placeholder.dataframe.call_count == 2
+        shown = placeholder.dataframe.call_args.args[0]
+        assert list(shown["match_score"]) == [90, 70, 40]
+
+
 # ---------------------------------------------------------------------------
 # render_history_page — direct call tests
 # ---------------------------------------------------------------------------
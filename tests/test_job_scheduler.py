@@ -243,6 +243,23 @@ class TestRunDailyDigestLogging:
         assert summary_lines, "Expected a summary log line even with zero users"
 
 
+class TestGeminiClient:
+    """_gemini_client() reuses one client per API key (cache_resource)."""
+
+    def test_client_reused_per_api_key(self):
+        """Repeated runs with the same key share a client; a new key gets its own."""
+        from src.job_scheduler import _gemini_client
+
+        _gemini_client.clear()
+        with patch("google.genai.Client", side_effect=lambda api_key: object()) as mock_client:
+            first = _gemini_client("key-a")
+            assert _gemini_client("key-a") is first
+            assert _gemini_client("key-b") is not first
+        _gemini_client.clear()
+
+        assert mock_client.call_count == 2
+
+
 class TestGetScheduler:
     """get_scheduler() returns the same object on repeated calls (cache_resource)."""
 
@@ -1,25 +1,100 @@
 """Tests for AI job scoring pipeline."""
 
 import json
+import threading
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
+from google.genai import errors, types
 
-from src.scoring import GEMINI_DELAY_SECONDS, score_jobs
+from src.scoring import (
+    _MAX_RETRIES,
+    _RETRY_BASE_DELAY,
+    _RETRY_JITTER,
+    _RETRY_MAX_DELAY,
+    GEMINI_BREAKER_MAX_PROBES,
+    GEMINI_BREAKER_RESET_SECONDS,
+    GEMINI_DELAY_SECONDS,
+    GEMINI_REQUEST_TIMEOUT_SECONDS,
+    _CircuitBreaker,
+    _retry_delay,
+    score_jobs,
+)
+
+
+def _response(payload):
+    """A stand-in Gemini response: score_jobs only reads .text.
+
+    Values are dicts/lists (sent as JSON) or raw response strings. A plain
+    namespace is much cheaper to build than a MagicMock per response.
+    """
+    return SimpleNamespace(text=payload if isinstance(payload, str) else json.dumps(payload))
 
 
 def _mock_client(responses):
     """Build a mock Gemini client returning given JSON dicts in sequence."""
     client = MagicMock()
-    side_effects = []
-    for resp in responses:
-        mock_resp = MagicMock()
-        mock_resp.text = json.dumps(resp)
-        side_effects.append(mock_resp)
-    client.models.generate_content.side_effect = side_effects
+    client.models.generate_content.side_effect = [_response(r) for r in responses]
+    return client
+
+
+def _keyed_client(responses_by_description):
+    """Build a mock Gemini client that answers based on the job in the prompt.
+
+    score_jobs runs calls concurrently, so tests that care which job got which
+    response must not rely on call order. Values are dicts (sent as JSON) or
+    raw response strings.
+    """
+
+    def _generate(**kwargs):
+        description = kwargs["contents"].rsplit("Job Description:\n", 1)[1]
+        return _response(responses_by_description[description])
+
+    client = MagicMock()
+    client.models.generate_content.side_effect = _generate
     return client
 
 
+def _quota_error(quota_id, retry_delay=None):
+    """A Gemini 429 shaped like the real body: shared status text, quota id in details."""
+    details = [{"@type": "type.googleapis.com/google.rpc.QuotaFailure", "violations": [{"quotaId": quota_id}]}]
+    if retry_delay is not None:
+        details.append({"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": retry_delay})
+    return errors.ClientError(
+        429,
+        {
+            "error": {
+                "code": 429,
+                "message": "You exceeded your current quota, please check your plan and billing details.",
+                "status": "RESOURCE_EXHAUSTED",
+                "details": details,
+            }
+        },
+    )
+
+
+def _fake_clock():
+    """Return (monotonic, sleep) stand-ins where time only moves when sleeping."""
+    now = [0.0]
+
+    def _sleep(seconds):
+        now[0] += seconds
+
+    return (lambda: now[0]), MagicMock(side_effect=_sleep)
+
+
+def _assert_one_full_pacing_pause(mock_sleep):
+    """Exactly one pacing pause, of (almost) the whole interval.
+
+    The pause is whatever remains of GEMINI_DELAY_SECONDS since the previous
+    call started, so the moment spent submitting that call comes off it.
+    """
+    mock_sleep.assert_called_once()
+    (pause,), _ = mock_sleep.call_args
+    assert GEMINI_DELAY_SECONDS - 0.1 < pause <= GEMINI_DELAY_SECONDS
+
+
 class TestScoreJobs:
     """Bugs here either send wrong data to Gemini, misparse the response,
     crash on unexpected API output, or skip rate limiting."""
@@ -41,11 +116,11 @@ class TestScoreJobs:
         df = pd.DataFrame(
             {"description": ["Python backend role", "Java frontend role"]}
         )
-        client = _mock_client(
-            [
-                {"match_score": 92, "reasoning": "Python expert"},
-                {"match_score": 30, "reasoning": "No Java skills"},
-            ]
+        client = _keyed_client(
+            {
+                "Python backend role": {"match_score": 92, "reasoning": "Python expert"},
+                "Java frontend role": {"match_score": 30, "reasoning": "No Java skills"},
+            }
         )
 
         with patch("src.scoring.time.sleep"):
@@ -72,9 +147,7 @@ class TestScoreJobs:
         """Gemini ignoring response_schema must not crash the pipeline."""
         df = pd.DataFrame({"description": ["A real job"]})
         client = MagicMock()
-        mock_resp = MagicMock()
-        mock_resp.text = "This is not JSON at all"
-        client.models.generate_content.return_value = mock_resp
+        client.models.generate_content.return_value = _response("This is not JSON at all")
 
         with patch("src.scoring.time.sleep"):
             result = score_jobs("CV", df, client)
@@ -93,6 +166,193 @@ class TestScoreJobs:
         assert result["match_score"].iloc[0] == 0
         assert "Scoring failed" in result["reasoning"].iloc[0]
 
+    def test_null_score_fails_only_that_row(self):
+        """One response with a null score must not crash the whole run."""
+        df = pd.DataFrame({"description": ["Job A", "Job B"]})
+        client = _keyed_client(
+            {
+                "Job A": {"match_score": 80, "reasoning": "Good"},
+                "Job B": {"match_score": None, "reasoning": "x"},
+            }
+        )
+
+        with patch("src.scoring.time.sleep"):
+            result = score_jobs("CV", df, client)
+
+        assert result["match_score"].tolist() == [80, 0]
+        assert "Scoring failed" in result["reasoning"].iloc[1]
+
+    def test_non_numeric_score_fails_gracefully(self):
+        """A score like "high" cannot be stored as a number."""
+        df = pd.DataFrame({"description": ["A job"]})
+        client = _mock_client([{"match_score": "high", "reasoning": "Good"}])
+
+        with patch("src.scoring.time.sleep"):
+            result = score_jobs("CV", df, client)
+
+        assert result["match_score"].iloc[0] == 0
+        assert "Scoring failed" in result["reasoning"].iloc[0]
+
+    def test_out_of_range_score_is_rounded_and_clamped(self):
+        """Scores are stored as whole numbers within 0-100."""
+        df = pd.DataFrame({"description": ["Job A", "Job B"]})
+        client = _keyed_client(
+            {
+                "Job A": {"match_score": 87.6, "reasoning": "Good"},
+                "Job B": {"match_score": 40000, "reasoning": "Great"},
+            }
+        )
+
+        with patch("src.scoring.time.sleep"):
+            result = score_jobs("CV", df, client)
+
+        assert result["match_score"].tolist() == [88, 100]
+
+    def test_transient_overload_is_retried_with_jittered_backoff(self):
+        """A 503 must not turn straight into a failed row."""
+        df = pd.DataFrame({"description": ["Job"]})
+        ok = _response({"match_score": 70, "reasoning": "Fine"})
+        client = MagicMock()
+        client.models.generate_content.side_effect = [
+            errors.ServerError(503, {"error": {"code": 503, "status": "UNAVAILABLE"}}),
+            ok,
+        ]
+
+        with patch("src.scoring.time.sleep") as mock_sleep:
+            result = score_jobs("CV", df, client)
+
+        assert result["match_score"].iloc[0] == 70
+        (delay,), _ = mock_sleep.call_args
+        assert _RETRY_BASE_DELAY <= delay <= _RETRY_BASE_DELAY * (1 + _RETRY_JITTER)
+
+    def test_daily_quota_exhausted_is_not_retried(self):
+        """Retrying an exhausted daily quota only burns time until reset."""
+        df = pd.DataFrame({"description": ["Job"]})
+        client = MagicMock()
+        client.models.generate_content.side_effect = _quota_error(
+            "GenerateRequestsPerDayPerProjectPerModel-FreeTier"
+        )
+
+        with patch("src.scoring.time.sleep") as mock_sleep:
+            result = score_jobs("CV", df, client)
+
+        client.models.generate_content.assert_called_once()
+        mock_sleep.assert_not_called()
+        assert "Scoring failed" in result["reasoning"].iloc[0]
+
+    def test_per_minute_rate_limit_is_retried_after_server_delay(self):
+        """A per-minute 429 waits out the server's retryDelay, then succeeds."""
+        df = pd.DataFrame({"description": ["Job"]})
+        client = MagicMock()
+        client.models.generate_content.side_effect = [
+            _quota_error("GenerateRequestsPerMinutePerProjectPerModel-FreeTier", retry_delay="7s"),
+            _response({"match_score": 70, "reasoning": "Fine"}),
+        ]
+
+        with patch("src.scoring.time.sleep") as mock_sleep:
+            result = score_jobs("CV", df, client)
+
+        assert result["match_score"].iloc[0] == 70
+        (delay,), _ = mock_sleep.call_args
+        assert 7 <= delay <= 7 * (1 + _RETRY_JITTER)
+
+    def test_retry_backoff_is_capped(self):
+        """Late retries must not back off without bound, and the cap is reached."""
+        assert _RETRY_MAX_DELAY <= _retry_delay(_MAX_RETRIES - 1)
+        assert _retry_delay(10) <= _RETRY_MAX_DELAY * (1 + _RETRY_JITTER)
+
+    def test_rate_limit_burst_does_not_trip_breaker(self):
+        """A burst of 429s means Gemini is up: only those rows fail, the rest get scored."""
+        burst = 5
+        df = pd.DataFrame({"description": [f"Job {i}" for i in range(12)]})
+        client = MagicMock()
+        client.models.generate_content.side_effect = [
+            _quota_error("GenerateRequestsPerMinutePerProjectPerModel-FreeTier")
+        ] * burst + [_response({"match_score": 70, "reasoning": "Fine"})] * (len(df) - burst)
+
+        with (
+            patch("src.scoring.GEMINI_MAX_WORKERS", 1),
+            patch("src.scoring.GEMINI_BREAKER_FAILURE_THRESHOLD", 2),
+            patch("src.scoring._MAX_RETRIES", 0),
+            patch("src.scoring.time.sleep"),
+        ):
+            result = score_jobs("CV", df, client)
+
+        assert client.models.generate_content.call_count == len(df)
+        assert not result["reasoning"].str.contains("breaker open").any()
+        assert (result["match_score"].iloc[burst:] == 70).all()
+
+    def test_open_breaker_holds_jobs_until_probe_succeeds(self):
+        """After an outage, later jobs wait out the reset and are scored once a probe gets through."""
+        threshold = 2
+        df = pd.DataFrame({"description": [f"Job {i}" for i in range(6)]})
+        client = MagicMock()
+        client.models.generate_content.side_effect = [
+            errors.ServerError(503, {"error": {"code": 503, "status": "UNAVAILABLE"}})
+        ] * threshold + [_response({"match_score": 70, "reasoning": "Fine"})] * (len(df) - threshold)
+        monotonic, sleep = _fake_clock()
+
+        with (
+            patch("src.scoring.GEMINI_MAX_WORKERS", 1),
+            patch("src.scoring.GEMINI_BREAKER_FAILURE_THRESHOLD", threshold),
+            patch("src.scoring._MAX_RETRIES", 0),
+            patch("src.scoring.time.monotonic", monotonic),
+            patch("src.scoring.time.sleep", sleep),
+        ):
+            result = score_jobs("CV", df, client)
+
+        assert client.models.generate_content.call_count == len(df)
+        assert (result["match_score"].iloc[threshold:] == 70).all()
+        assert sum(pause for (pause,), _ in sleep.call_args_list) >= GEMINI_BREAKER_RESET_SECONDS
+
+    def test_sustained_outage_gives_up_after_failed_probes(self):
+        """Once probes keep failing, later jobs skip the call and the pacing."""
+        threshold, probes = 2, GEMINI_BREAKER_MAX_PROBES
+        df = pd.DataFrame({"description": [f"Job {i}" for i in range(8)]})
+        client = MagicMock()
+        client.models.generate_content.side_effect = errors.ServerError(
+            503, {"error": {"code": 503, "status": "UNAVAILABLE"}}
+        )
+        monotonic, sleep = _fake_clock()
+
+        with (
+            patch("src.scoring.GEMINI_MAX_WORKERS", 1),
+            patch("src.scoring.GEMINI_BREAKER_FAILURE_THRESHOLD", threshold),
+            patch("src.scoring._MAX_RETRIES", 0),
+            patch("src.scoring.time.monotonic", monotonic),
+            patch("src.scoring.time.sleep", sleep),
+        ):
+            result = score_jobs("CV", df, client)
+
+        assert client.models.generate_content.call_count == threshold + probes
+        assert (result["match_score"] == 0).all()
+        assert result["reasoning"].iloc[threshold + probes :].str.startswith("Scoring failed (breaker open)").all()
+
+    def test_breaker_half_open_probe_closes_on_success(self):
+        """After the cooldown one probe goes through, and success closes the breaker."""
+        breaker = _CircuitBreaker(failure_threshold=1, reset_timeout=30, max_probes=3)
+        monotonic, sleep = _fake_clock()
+
+        with patch("src.scoring.time.monotonic", monotonic), patch("src.scoring.time.sleep", sleep):
+            breaker.record_failure()
+            assert breaker.wait_until_allowed()
+        sleep.assert_called_once_with(30)
+        assert breaker.state == _CircuitBreaker.HALF_OPEN
+
+        breaker.record_success()
+        assert breaker.state == _CircuitBreaker.CLOSED
+
+    def test_realtime_calls_carry_a_request_timeout(self):
+        """A hung Gemini connection must not hold a worker forever."""
+        df = pd.DataFrame({"description": ["Job"]})
+        client = _mock_client([{"match_score": 50, "reasoning": "OK"}])
+
+        with patch("src.scoring.time.sleep"):
+            score_jobs("CV", df, client)
+
+        config = client.models.generate_content.call_args.kwargs["config"]
+        assert config.http_options.timeout == GEMINI_REQUEST_TIMEOUT_SECONDS * 1000
+
     def test_rate_limit_delay_value_is_correct(self):
         """Wrong delay value = getting blocked by Gemini."""
         df = pd.DataFrame({"description": ["Job A", "Job B"]})
@@ -106,7 +366,7 @@ class TestScoreJobs:
         with patch("src.scoring.time.sleep") as mock_sleep:
             score_jobs("CV", df, client)
 
-        mock_sleep.assert_called_once_with(GEMINI_DELAY_SECONDS)
+        _assert_one_full_pacing_pause(mock_sleep)
 
     def test_no_sleep_after_last_job(self):
         """No wasted time sleeping after the final job."""
@@ -118,6 +378,51 @@ class TestScoreJobs:
 
         mock_sleep.assert_not_called()
 
+    def test_no_sleep_for_trailing_jobs_without_description(self):
+        """Rows that never reach Gemini must not add pacing delays either."""
+        df = pd.DataFrame({"description": ["Job A", "Job B", None, "", "   "]})
+        client = _keyed_client(
+            {
+                "Job A": {"match_score": 80, "reasoning": "A"},
+                "Job B": {"match_score": 70, "reasoning": "B"},
+            }
+        )
+
+        with patch("src.scoring.time.sleep") as mock_sleep:
+            result = score_jobs("CV", df, client)
+
+        _assert_one_full_pacing_pause(mock_sleep)
+        assert list(result["match_score"]) == [80, 70, 0, 0, 0]
+
+    def test_calls_wait_for_a_free_worker_before_pacing(self):
+        """With every worker busy, the next call must not be queued early.
+
+        A queued call starts the moment a worker frees up, so several of them
+        could hit Gemini together regardless of the pacing delay. The wait for
+        the worker counts towards the delay, so the pause only tops it up.
+        """
+        call_seconds = 0.2
+        df = pd.DataFrame({"description": ["Job A", "Job B", "Job C"]})
+        finished = []
+
+        def _generate(**kwargs):
+            threading.Event().wait(call_seconds)  # time.sleep is patched below
+            finished.append(kwargs["contents"])
+            return _response({"match_score": 50, "reasoning": "OK"})
+
+        client = MagicMock()
+        client.models.generate_content.side_effect = _generate
+        pauses = []
+
+        with (
+            patch("src.scoring.GEMINI_MAX_WORKERS", 1),
+            patch("src.scoring.time.sleep", side_effect=lambda s: pauses.append((len(finished), s))),
+        ):
+            score_jobs("CV", df, client)
+
+        assert [done for done, _ in pauses] == [1, 2]
+        assert all(pause <= GEMINI_DELAY_SECONDS - call_seconds * 0.9 for _, pause in pauses)
+
     def test_does_not_mutate_input_dataframe(self):
         """Mutating input df corrupts data shown in the 'All jobs' expander."""
         df = pd.DataFrame({"description": ["A job"], "title": ["Engineer"]})
@@ -136,14 +441,13 @@ class TestScoreJobs:
         df = pd.DataFrame(
             {"description": ["Good job", "Crash job", "Another good job"]}
         )
-        client = MagicMock()
-        resp_ok1 = MagicMock()
-        resp_ok1.text = json.dumps({"match_score": 85, "reasoning": "Great"})
-        resp_fail = MagicMock()
-        resp_fail.text = "NOT JSON"
-        resp_ok2 = MagicMock()
-        resp_ok2.text = json.dumps({"match_score": 60, "reasoning": "Decent"})
-        client.models.generate_content.side_effect = [resp_ok1, resp_fail, resp_ok2]
+        client = _keyed_client(
+            {
+                "Good job": {"match_score": 85, "reasoning": "Great"},
+                "Crash job": "NOT JSON",
+                "Another good job": {"match_score": 60, "reasoning": "Decent"},
+            }
+        )
 
         with patch("src.scoring.time.sleep"):
             result = score_jobs("CV", df, client)
@@ -171,6 +475,37 @@ class TestScoreJobs:
         callback.assert_any_call(1, 2)
         callback.assert_any_call(2, 2)
 
+    def test_result_callback_receives_each_row(self):
+        """Result callback gets every row position, including duplicated descriptions."""
+        df = pd.DataFrame({"description": ["Job A", "Job B", "Job A"]})
+        client = _keyed_client(
+            {
+                "Job A": {"match_score": 80, "reasoning": "A"},
+                "Job B": {"match_score": 70, "reasoning": "B"},
+            }
+        )
+        callback = MagicMock()
+
+        with patch("src.scoring.time.sleep"):
+            score_jobs("CV", df, client, result_callback=callback)
+
+        assert sorted(c.args for c in callback.call_args_list) == [
+            (0, 80, "A"),
+            (1, 70, "B"),
+            (2, 80, "A"),
+        ]
+
+    def test_match_score_column_is_compact(self):
+        """Scores fit in int16; the column must not widen back to int64."""
+        df = pd.DataFrame({"description": ["Job A", ""]})
+        client = _mock_client([{"match_score": 80, "reasoning": "A"}])
+
+        with patch("src.scoring.time.sleep"):
+            result = score_jobs("CV", df, client)
+
+        assert result["match_score"].dtype == "int16"
+        assert list(result["match_score"]) == [80, 0]
+
     def test_curly_braces_in_description_dont_crash(self):
         """Job descriptions with code snippets like function() { ... } must
         not crash prompt building. This was a real bug with str.format()."""
@@ -198,3 +533,207 @@ class TestScoreJobs:
         assert result["match_score"].iloc[0] == 0
         assert "No description column" in result["reasoning"].iloc[0]
         client.models.generate_content.assert_not_called()
+
+    def test_crashed_call_does_not_poison_other_jobs(self):
+        """An exception escaping one worker must only fail that job's row."""
+        df = pd.DataFrame({"description": ["Job A", "Job B"]})
+
+        def _score(client, config, cv_text, description, breaker=None):
+            if description == "Job A":
+                raise RuntimeError("worker died")
+            return 70, "B"
+
+        with (
+            patch("src.scoring.time.sleep"),
+            patch("src.scoring._score_single", side_effect=_score),
+        ):
+            result = score_jobs("CV", df, MagicMock())
+
+        assert result["match_score"].iloc[0] == 0
+        assert "worker died" in result["reasoning"].iloc[0]
+        assert result["match_score"].iloc[1] == 70
+
+    def test_duplicate_descriptions_scored_once(self):
+        """Reposts with identical text must not burn extra Gemini calls,
+        but every copy still needs the score."""
+        df = pd.DataFrame({"description": ["Same JD", "Other JD", "Same JD"]})
+        client = _keyed_client(
+            {
+                "Same JD": {"match_score": 77, "reasoning": "Same"},
+                "Other JD": {"match_score": 20, "reasoning": "Other"},
+            }
+        )
+        callback = MagicMock()
+
+        with patch("src.scoring.time.sleep") as mock_sleep:
+            result = score_jobs("CV", df, client, progress_callback=callback)
+
+        assert client.models.generate_content.call_count == 2
+        _assert_one_full_pacing_pause(mock_sleep)
+        assert list(result["match_score"]) == [77, 20, 77]
+        assert result.iloc[2]["reasoning"] == "Same"
+        callback.assert_called_with(3, 3)
+
+    def test_reposts_differing_only_in_whitespace_scored_once(self):
+        """The same JD scraped from two boards often differs only in line breaks."""
+        df = pd.DataFrame({"description": ["Build APIs.\n\nPython", "Build APIs. Python "]})
+        client = _keyed_client({"Build APIs.\n\nPython": {"match_score": 81, "reasoning": "Fit"}})
+
+        with patch("src.scoring.time.sleep"):
+            result = score_jobs("CV", df, client)
+
+        client.models.generate_content.assert_called_once()
+        assert list(result["match_score"]) == [81, 81]
+
+    def test_prefilter_skips_off_target_jobs(self):
+        """Jobs with no overlap with the CV must not cost a Gemini call."""
+        df = pd.DataFrame(
+            {"description": ["Python AWS backend engineer", "Registered nurse night shifts"]}
+        )
+        client = _keyed_client(
+            {"Python AWS backend engineer": {"match_score": 88, "reasoning": "Fit"}}
+        )
+
+        with patch("src.scoring.time.sleep"):
+            result = score_jobs(
+                "Backend engineer: Python, AWS", df, client, prefilter_threshold=60
+            )
+
+        client.models.generate_content.assert_called_once()
+        assert result.iloc[0]["match_score"] == 88
+        assert result.iloc[1]["match_score"] == 0
+        assert result.iloc[1]["reasoning"].startswith("Prefilter")
+
+    def test_cached_prefix_sends_only_job_text(self):
+        """With a context cache, calls reference it instead of resending the CV."""
+        df = pd.DataFrame({"description": ["Go microservices"]})
+        client = _mock_client([{"match_score": 60, "reasoning": "OK"}])
+        client.caches.create.return_value.name = "cachedContents/cv-1"
+
+        with patch("src.scoring.time.sleep"):
+            result = score_jobs("My long CV", df, client, cache_prompt_prefix=True)
+
+        kwargs = client.models.generate_content.call_args.kwargs
+        assert kwargs["config"].cached_content == "cachedContents/cv-1"
+        assert "My long CV" not in kwargs["contents"]
+        assert "Go microservices" in kwargs["contents"]
+        client.caches.delete.assert_called_once_with(name="cachedContents/cv-1")
+        assert result["match_score"].iloc[0] == 60
+
+    def test_cache_failure_falls_back_to_inline_prompt(self):
+        """A prefix too small to cache must not break scoring."""
+        df = pd.DataFrame({"description": ["Go microservices"]})
+        client = _mock_client([{"match_score": 60, "reasoning": "OK"}])
+        client.caches.create.side_effect = RuntimeError("below minimum token count")
+
+        with patch("src.scoring.time.sleep"):
+            score_jobs("My long CV", df, client, cache_prompt_prefix=True)
+
+        kwargs = client.models.generate_content.call_args.kwargs
+        assert kwargs["config"].cached_content is None
+        assert "My long CV" in kwargs["contents"]
+
+    def test_batch_mode_scores_several_jobs_in_one_call(self):
+        """Batching must cut request count without mixing up row alignment."""
+        df = pd.DataFrame(
+            {"description": ["Python backend role", None, "Java frontend role"]}
+        )
+        client = MagicMock()
+        client.models.generate_content.return_value = _response(
+            [
+                {"match_score": 92, "reasoning": "Python expert"},
+                {"match_score": 30, "reasoning": "No Java skills"},
+            ]
+        )
+
+        with patch("src.scoring.time.sleep") as mock_sleep:
+            result = score_jobs("Python dev CV", df, client, batch_size=5)
+
+        client.models.generate_content.assert_called_once()
+        mock_sleep.assert_not_called()
+        prompt = client.models.generate_content.call_args[1]["contents"]
+        assert "### JOB 1\nPython backend role" in prompt
+        assert "### JOB 2\nJava frontend role" in prompt
+        assert list(result["match_score"]) == [92, 0, 30]
+        assert result.iloc[1]["reasoning"] == "No job description available."
+        assert result.iloc[2]["reasoning"] == "No Java skills"
+
+    def test_batch_with_wrong_result_count_fails_whole_batch(self):
+        """If Gemini drops a job from the array we can't tell which one —
+        every job in that batch must be marked failed, not shifted."""
+        df = pd.DataFrame({"description": ["Job A", "Job B"]})
+        client = _mock_client([[{"match_score": 80, "reasoning": "A"}]])
+
+        with patch("src.scoring.time.sleep"):
+            result = score_jobs("CV", df, client, batch_size=2)
+
+        assert list(result["match_score"]) == [0, 0]
+        assert all("Scoring failed" in r for r in result["reasoning"])
+
+
+def _inlined(text=None, key="0", error=None):
+    """Build a Batch API inlined response carrying the submitted metadata key."""
+    return SimpleNamespace(
+        metadata={"key": key},
+        error=error,
+        response=None if text is None else _response(text),
+    )
+
+
+class TestScoreJobsBatchApi:
+    """The Batch API path is asynchronous — the risk is mapping responses
+    back to the wrong rows or hanging forever on a dead job."""
+
+    def test_responses_mapped_back_by_submitted_key(self):
+        df = pd.DataFrame({"description": ["Job A", None, "Job B"]})
+        client = MagicMock()
+        running = MagicMock(state=types.JobState.JOB_STATE_RUNNING)
+        finished = MagicMock(state=types.JobState.JOB_STATE_SUCCEEDED)
+        # Returned out of order — keys, not positions, must decide the row
+        finished.dest.inlined_responses = [
+            _inlined(json.dumps({"match_score": 40, "reasoning": "B"}), key="1"),
+            _inlined(json.dumps({"match_score": 90, "reasoning": "A"}), key="0"),
+        ]
+        client.batches.create.return_value = running
+        client.batches.get.return_value = finished
+
+        with patch("src.scoring.time.sleep"):
+            result = score_jobs("CV", df, client, use_batch_api=True)
+
+        client.models.generate_content.assert_not_called()
+        requests = client.batches.create.call_args[1]["src"]
+        assert len(requests) == 2
+        assert "Job A" in requests[0].contents
+        assert requests[0].config.http_options is None
+        assert list(result["match_score"]) == [90, 0, 40]
+        assert result.iloc[2]["reasoning"] == "B"
+
+    def test_failed_request_inside_job_only_fails_its_row(self):
+        df = pd.DataFrame({"description": ["Job A", "Job B"]})
+        client = MagicMock()
+        job = MagicMock(state=types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED)
+        job.dest.inlined_responses = [
+            _inlined(json.dumps({"match_score": 90, "reasoning": "A"}), key="0"),
+            _inlined(key="1", error="INTERNAL"),
+        ]
+        client.batches.create.return_value = job
+
+        with patch("src.scoring.time.sleep"):
+            result = score_jobs("CV", df, client, use_batch_api=True)
+
+        assert result.iloc[0]["match_score"] == 90
+        assert result.iloc[1]["match_score"] == 0
+        assert "Scoring failed" in result.iloc[1]["reasoning"]
+
+    def test_failed_job_falls_back_to_realtime_scoring(self):
+        df = pd.DataFrame({"description": ["Only job"]})
+        client = _mock_client([{"match_score": 55, "reasoning": "Realtime"}])
+        client.batches.create.return_value = MagicMock(
+            state=types.JobState.JOB_STATE_FAILED
+        )
+
+        with patch("src.scoring.time.sleep"):
+            result = score_jobs("CV", df, client, use_batch_api=True)
+
+        assert result["match_score"].iloc[0] == 55
+        client.models.generate_content.assert_called_once()
@@ -1,11 +1,42 @@
 """Tests for the sponsor register loading and verification logic."""
 
-from unittest.mock import patch
+import io
+from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pandas as pd
 import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+from rapidfuzz import fuzz, process
 
-from src.sponsors import SPONSOR_MATCH_THRESHOLD, load_sponsor_register, verify_sponsors
+from src.sponsors import (
+    SPONSOR_MATCH_THRESHOLD,
+    SPONSOR_PAGE_URL,
+    _match_key,
+    load_sponsor_register,
+    verify_sponsors,
+)
+
+
+def _mock_http(html, csv_text="Org\n"):
+    """Patch the shared HTTP session: the gov.uk page returns html, any other
+    URL returns csv_text as the CSV body. Yields the mocked get for asserts."""
+
+    def _get(url, **kwargs):
+        resp = MagicMock()
+        if url == SPONSOR_PAGE_URL:
+            resp.text = html
+        else:
+            resp.raw = io.BytesIO(csv_text.encode())
+        return resp
+
+    return patch("src.sponsors._SESSION.get", side_effect=_get)
+
+
+def _csv_urls_fetched(mock_get):
+    """URLs requested from the session other than the gov.uk page."""
+    return [c.args[0] for c in mock_get.call_args_list if c.args[0] != SPONSOR_PAGE_URL]
 
 
 class TestVerifySponsors:
@@ -22,6 +53,16 @@ class TestVerifySponsors:
         assert result["verified_sponsor"].iloc[0] == True  # noqa: E712
         assert result["sponsor_match_score"].iloc[0] == 100
 
+    def test_exact_match_skips_fuzzy_scan(self):
+        """Exact register hits are answered from the set, not by rapidfuzz."""
+        names = pd.Series(["Deloitte LLP", "Delloite LLP"])
+        with patch("src.sponsors.process.cdist", wraps=process.cdist) as mock_cdist:
+            result = verify_sponsors(names, ["deloitte llp", "acme ltd"])
+
+        assert list(result["sponsor_match_score"])[0] == 100
+        assert result["verified_sponsor"].all()
+        assert mock_cdist.call_args[0][0] == ["delloite llp"]
+
     def test_completely_different_name_rejected(self):
         """Unrelated companies must never match — a false positive here
         sends users to companies that can't sponsor their visa."""
@@ -58,6 +99,13 @@ class TestVerifySponsors:
             if should_match:
                 assert matched == True, f"'{company}' should match but didn't"  # noqa: E712
 
+    def test_legal_suffix_variations_match(self):
+        """'Acme Limited' on a job board is the same employer as 'acme ltd'
+        in the register — suffix noise must not hide a real sponsor."""
+        names = pd.Series(["Acme Limited", "Acme UK Ltd.", "Acme Holdings"])
+        result = verify_sponsors(names, ["acme ltd"])
+        assert list(result["verified_sponsor"]) == [True, True, False]
+
     def test_nan_mixed_with_valid_preserves_alignment(self):
         """NaN values must not shift results to wrong companies."""
         names = pd.Series([None, "apple", None, "google", None], index=[5, 6, 7, 8, 9])
@@ -83,6 +131,40 @@ class TestVerifySponsors:
         result = verify_sponsors(names, ["apple"])
         assert result["verified_sponsor"].iloc[2] == True  # noqa: E712
 
+    def test_empty_register_matches_nothing(self):
+        """An empty register (e.g. gov.uk page changed) must not crash matching."""
+        names = pd.Series(["Deloitte LLP", None])
+        result = verify_sponsors(names, ())
+        assert not result["verified_sponsor"].any()
+        assert list(result["sponsor_match_score"]) == [0, 0]
+
+    @settings(max_examples=100, deadline=None)
+    @given(
+        names=st.lists(st.text(alphabet="abcd ", min_size=1, max_size=20), min_size=1, max_size=8),
+        sponsors=st.lists(st.text(alphabet="abcd ", min_size=1, max_size=30), max_size=30),
+    )
+    def test_length_pruning_matches_brute_force(self, names, sponsors):
+        """Length pruning and pre-sorted tokens must never change a result.
+
+        The brute force re-orders each query's tokens, so it only agrees with
+        verify_sponsors if scoring really is token-order independent.
+        """
+        result = verify_sponsors(pd.Series(names), sponsors)
+
+        keys = [_match_key(s) for s in sponsors]
+        for name, score in zip(names, result["sponsor_match_score"]):
+            query = " ".join(reversed(_match_key(name).split()))
+            if not query or not keys:
+                expected = 0
+            else:
+                expected = int(
+                    process.cdist(
+                        [query], keys, scorer=fuzz.token_sort_ratio, processor=None,
+                        score_cutoff=SPONSOR_MATCH_THRESHOLD, dtype=np.uint8,
+                    ).max()
+                )
+            assert score == expected
+
     def test_result_dataframe_shape(self):
         """Output must always have exactly 2 columns and same index as input."""
         names = pd.Series(["a", "b", "c"], index=[100, 200, 300])
@@ -98,35 +180,48 @@ class TestLoadSponsorRegister:
         """Clear lru_cache between tests so mocked responses aren't cached."""
         load_sponsor_register.cache_clear()
 
+    @pytest.fixture(autouse=True)
+    def _isolate_disk_cache(self, tmp_path):
+        """Point the on-disk cache at a temp dir and stub the ETag lookup, so
+        tests never read a real cached register or touch the network."""
+        with (
+            patch("src.sponsors.SPONSOR_CACHE_DIR", tmp_path),
+            patch("src.sponsors._SESSION.head") as mock_head,
+        ):
+            mock_head.return_value.headers = {}
+            self.mock_head = mock_head
+            yield
+
     def test_normalises_company_names(self):
         """Gov register has messy data. Without normalisation, fuzzy matching breaks."""
         html = '<a href="https://x.com/Worker.csv">W</a>'
-        csv_data = pd.DataFrame(
-            {"Organisation Name": ["  DELOITTE LLP  ", "google uk limited", " Apple "]}
-        )
+        csv_text = "Organisation Name\n  DELOITTE LLP  \ngoogle uk limited\n Apple \n"
 
-        with (
-            patch("src.sponsors.requests.get") as mock_get,
-            patch("src.sponsors.pd.read_csv", return_value=csv_data),
-        ):
-            mock_get.return_value.text = html
+        with _mock_http(html, csv_text):
             result = load_sponsor_register()
 
         assert result == ("deloitte llp", "google uk limited", "apple")
 
+    def test_repeated_register_rows_kept_once(self):
+        """The register repeats an organisation per route and town."""
+        html = '<a href="https://x.com/Worker.csv">W</a>'
+        csv_text = "Org,Town\nAcme,Leeds\nBeta,York\n ACME ,London\n"
+
+        with _mock_http(html, csv_text):
+            result = load_sponsor_register()
+
+        assert result == ("acme", "beta")
+
     def test_drops_nan_rows(self):
         """Blank rows in the CSV must not leak NaN into the sponsor list."""
         html = '<a href="https://x.com/Worker.csv">W</a>'
-        csv_data = pd.DataFrame({"Org": ["Apple", None, "", "Google", None]})
+        csv_text = 'Org,Town\nApple,London\n,Leeds\n"",York\nGoogle,London\n,Bath\n'
 
-        with (
-            patch("src.sponsors.requests.get") as mock_get,
-            patch("src.sponsors.pd.read_csv", return_value=csv_data),
-        ):
-            mock_get.return_value.text = html
+        with _mock_http(html, csv_text):
             result = load_sponsor_register()
 
         assert None not in result
+        assert not any(pd.isna(name) for name in result)
         assert "apple" in result
         assert "google" in result
 
@@ -136,41 +231,105 @@ class TestLoadSponsorRegister:
         <a href="https://x.com/student_sponsors.csv">Student</a>
         <a href="https://x.com/Worker_and_Temp.csv">Worker</a>
         """
-        csv_data = pd.DataFrame({"Org": ["Correct"]})
 
-        with (
-            patch("src.sponsors.requests.get") as mock_get,
-            patch("src.sponsors.pd.read_csv", return_value=csv_data) as mock_csv,
-        ):
-            mock_get.return_value.text = html
+        with _mock_http(html, "Org\nCorrect\n") as mock_get:
+            load_sponsor_register()
+
+        assert _csv_urls_fetched(mock_get) == ["https://x.com/Worker_and_Temp.csv"]
+
+    def test_worker_link_found_in_real_page_markup(self):
+        """gov.uk wraps link text in spans and spreads attributes over lines."""
+        html = """
+        <a class="govuk-link" href="https://x.com/Temp.csv" aria-describedby="a">Temporary</a>
+        <a class="govuk-link"
+           href="https://x.com/Worker_&amp;_Temp.csv"><span>Register of
+           <b>Worker</b> sponsors</span></a>
+        """
+
+        with _mock_http(html, "Org\nCorrect\n") as mock_get:
             load_sponsor_register()
 
-        mock_csv.assert_called_once_with("https://x.com/Worker_and_Temp.csv")
+        assert _csv_urls_fetched(mock_get) == ["https://x.com/Worker_&_Temp.csv"]
 
     def test_no_csv_link_returns_empty(self):
         """Graceful failure if gov.uk changes their page structure."""
         html = "<html><body><p>Page redesigned, no CSV links</p></body></html>"
-        with patch("src.sponsors.requests.get") as mock_get:
-            mock_get.return_value.text = html
+        with _mock_http(html):
             result = load_sponsor_register()
         assert result == ()
 
     def test_network_timeout_raises(self):
         """Network failure must propagate — caller shows error to user."""
-        with patch("src.sponsors.requests.get", side_effect=ConnectionError("timeout")):
+        with patch("src.sponsors._SESSION.get", side_effect=ConnectionError("timeout")):
             with pytest.raises(ConnectionError):
                 load_sponsor_register()
 
     def test_uses_first_column_regardless_of_name(self):
         """The CSV column name might change. We always read column 0."""
         html = '<a href="https://x.com/Worker.csv">W</a>'
-        csv_data = pd.DataFrame({"Completely New Column Name": ["Acme Corp"]})
+        csv_text = "Completely New Column Name,Town\nAcme Corp,London\n"
+
+        with _mock_http(html, csv_text):
+            result = load_sponsor_register()
+
+        assert result == ("acme corp",)
+
+    def test_empty_or_malformed_csv_returns_empty(self):
+        """A truncated download must not crash app startup."""
+        html = '<a href="https://x.com/Worker.csv">W</a>'
+        for body in ["", "Org\nAcme,Extra field\n"]:
+            load_sponsor_register.cache_clear()
+            with _mock_http(html, body):
+                assert load_sponsor_register() == ()
+
+    def test_disk_cache_reused_while_etag_unchanged(self):
+        """A new process must not re-download the register if gov.uk still
+        serves the same file."""
+        html = '<a href="https://x.com/Worker.csv">W</a>'
+        self.mock_head.return_value.headers = {"ETag": '"v1"'}
+
+        with (
+            patch("src.sponsors.SPONSOR_CACHE_MAX_AGE_SECONDS", 0),  # always revalidate
+            _mock_http(html, "Org\n Apple \nGoogle\n") as mock_get,
+        ):
+            first = load_sponsor_register()
+            load_sponsor_register.cache_clear()  # simulate a fresh process
+            second = load_sponsor_register()
+
+        assert first == second == ("apple", "google")
+        assert len(_csv_urls_fetched(mock_get)) == 1
+
+    def test_disk_cache_refreshed_when_etag_changes(self):
+        """Once the cache is past its freshness window, a new register version
+        must replace the cached one."""
+        html = '<a href="https://x.com/Worker.csv">W</a>'
+        self.mock_head.return_value.headers = {"ETag": '"v1"'}
 
+        with _mock_http(html, "Org\nOld\n"):
+            load_sponsor_register()
+        load_sponsor_register.cache_clear()
+        self.mock_head.return_value.headers = {"ETag": '"v2"'}
         with (
-            patch("src.sponsors.requests.get") as mock_get,
-            patch("src.sponsors.pd.read_csv", return_value=csv_data),
+            patch("src.sponsors.SPONSOR_CACHE_MAX_AGE_SECONDS", 0),
+            _mock_http(html, "Org\nNew\n"),
         ):
-            mock_get.return_value.text = html
             result = load_sponsor_register()
 
-        assert result == ("acme corp",)
+        assert result == ("new",)
+
+    def test_fresh_disk_cache_skips_network(self):
+        """A recently fetched register is used without even loading the gov.uk page."""
+        html = '<a href="https://x.com/Worker.csv">W</a>'
+        self.mock_head.return_value.headers = {"ETag": '"v1"'}
+
+        with _mock_http(html, "Org\nAcme\n"):
+            load_sponsor_register()
+        load_sponsor_register.cache_clear()
+        self.mock_head.reset_mock()
+
+        with _mock_http(html, "Org\nOther\n") as mock_get:
+            result = load_sponsor_register()
+
+        assert result == ("acme",)
+        mock_get.assert_not_called()
+        self.mock_head.assert_not_called()